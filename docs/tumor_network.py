@@ -1,873 +1,1570 @@
 import pandas as pd
-import networkx as nx
 import numpy as np
-from collections import Counter
 import os
 import json
+import base64
 import webbrowser
 import colorsys
 import math
+from decimal import Decimal, ROUND_HALF_UP
 
-def create_web_network(input_file='data/tumor.csv', central_node='GCH1', output_file='Network Tumor/index.html'):
-    """Create web-based interactive network visualization and save as HTML file"""
-    print(f"Loading data from {input_file}...")
+# Interactive page template; the placeholders are filled with the node and link JSON
+HTML_TEMPLATE = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Gene Association Network</title>
+    <style>
+        body {
+            margin: 0;
+            padding: 0;
+            overflow: hidden;
+            font-family: Arial, sans-serif;
+        }
+        #container {
+            width: 100vw;
+            height: 100vh;
+            position: relative;
+            background-color: white;
+        }
+        #network-canvas, #gl-canvas {
+            position: absolute;
+            left: 0;
+            top: 0;
+            width: 100%;
+            height: 100%;
+        }
+        #gl-canvas {
+            pointer-events: none;
+        }
+        #title {
+            text-align: center;
+            font-size: 20px;
+            margin-top: 10px;
+            position: absolute;
+            width: 100%;
+            z-index: 10;
+        }
+        #legend {
+            position: absolute;
+            top: 10px;
+            left: 10px;
+            background: white;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+            padding: 10px;
+            max-height: 80vh;
+            overflow-y: auto;
+            z-index: 1000;
+        }
+        .legend-item {
+            display: flex;
+            align-items: center;
+            margin: 5px 0;
+            font-size: 12px;
+        }
+        .legend-color {
+            width: 12px;
+            height: 12px;
+            border-radius: 50%;
+            display: inline-block;
+            margin-right: 5px;
+        }
+        .label {
+            background-color: white;
+            border: 1px solid rgba(0,0,0,0.2);
+            padding: 3px 6px;
+            border-radius: 3px;
+            font-size: 12px;
+            pointer-events: none;
+            white-space: nowrap;
+        }
+        .node-central {
+            cursor: pointer;
+            stroke: #000;
+            stroke-width: 1.5px;
+        }
+        .node-tissue {
+            cursor: pointer;
+            stroke: #000;
+            stroke-width: 1px;
+        }
+        .node-gene {
+            cursor: pointer;
+        }
+        .link {
+            stroke: #999;
+            stroke-opacity: 0.2;
+        }
+        #tooltip {
+            position: absolute;
+            background: rgba(255, 255, 255, 0.9);
+            border: 1px solid #ddd;
+            border-radius: 4px;
+            padding: 5px;
+            pointer-events: none;
+            font-size: 12px;
+            display: none;
+            z-index: 1000;
+        }
+        #instructions {
+            position: absolute;
+            bottom: 10px;
+            left: 10px;
+            background: white;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+            padding: 10px;
+            font-size: 12px;
+            z-index: 1000;
+        }
+        .download-btn {
+            position: absolute;
+            bottom: 10px;
+            right: 10px;
+            background: #4CAF50;
+            color: white;
+            border: none;
+            border-radius: 5px;
+            padding: 10px 15px;
+            font-size: 14px;
+            cursor: pointer;
+            z-index: 1000;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.2);
+            transition: all 0.3s;
+        }
+        .download-btn:hover {
+            background: #45a049;
+            box-shadow: 0 4px 8px rgba(0,0,0,0.3);
+        }
+        .controls {
+            position: absolute;
+            top: 50px;
+            right: 10px;
+            background: white;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+            padding: 10px;
+            z-index: 1000;
+            display: flex;
+            flex-direction: column;
+            gap: 5px;
+        }
+        .controls button {
+            background: #f0f0f0;
+            border: 1px solid #ddd;
+            border-radius: 3px;
+            padding: 5px 10px;
+            cursor: pointer;
+            transition: all 0.2s;
+        }
+        .controls button:hover {
+            background: #e0e0e0;
+        }
+    </style>
+</head>
+<body>
+    <div id="container">
+        <div id="title">Gene Association Network Centered on GCH1 in tumor tissue (PCC >= 0.8)</div>
+        <canvas id="gl-canvas"></canvas>
+        <canvas id="network-canvas"></canvas>
+        <div id="legend"></div>
+        <div id="tooltip"></div>
+        <div id="instructions">
+            <strong>Instructions:</strong><br>
+            • Click and drag nodes to move them<br>
+            • Use mouse wheel to zoom in/out<br>
+            • Click and drag background to move the entire network<br>
+            • Hover over nodes to see details
+        </div>
+        <div class="controls">
+            <button id="reset-zoom">Reset View</button>
+            <button id="auto-cluster">Optimize Layout</button>
+        </div>
+        <button id="download-btn" class="download-btn">Download High-Res PNG</button>
+    </div>
     
-    try:
-        # Read and filter data
-        df = pd.read_csv(input_file)
-        filtered_df = df[df['PCC'] >= 0.8].copy()
-        type_column = 'Tumor'
+    <script>
+        // Network data (columns indexed by node / link)
+        const nodesData = NODES_DATA_PLACEHOLDER;
+        const linksData = LINKS_DATA_PLACEHOLDER;
         
-        # Count genes for each tissue type
-        tissue_types = filtered_df[type_column].unique()
-        tissue_gene_counts = Counter(filtered_df[type_column])
-        print(f"Found {len(tissue_types)} tissue types with {len(filtered_df)} genes")
+        // Decode a base64 column of little-endian values into a typed array
+        function decodeColumn(base64, ArrayType) {
+            const bytes = Uint8Array.from(atob(base64), c => c.charCodeAt(0));
+            return new ArrayType(bytes.buffer);
+        }
         
-        # Create graph
-        G = nx.Graph()
+        // Nodes are referred to by index; numeric fields live in typed arrays updated in place
+        const nodeCount = nodesData.id.length;
+        const nodeX = decodeColumn(nodesData.x, Float32Array);
+        const nodeY = decodeColumn(nodesData.y, Float32Array);
+        const nodeSize = decodeColumn(nodesData.size, Uint8Array);
+        const nodePcc = Float64Array.from(decodeColumn(nodesData.pcc, Int16Array), v => v / 1000);
+        const palette = nodesData.palette;
+        const nodeColorIndex = decodeColumn(nodesData.color, Uint8Array);
+        const nodeColor = Array.from(nodeColorIndex, i => palette[i]);
+        const nodeId = nodesData.id;
+        const nodeType = nodesData.node_type;
+        const nodeLabel = nodesData.label;
+        const nodeGeneCount = nodesData.gene_count;
+        const nodeTissue = nodesData.tissue;
         
-        # Add central node
-        G.add_node(central_node, node_type='central')
+        // Link endpoints as node indices
+        const LinkIndexArray = linksData.index_bytes === 2 ? Uint16Array : Uint32Array;
+        const linkSource = decodeColumn(linksData.source, LinkIndexArray);
+        const linkTarget = decodeColumn(linksData.target, LinkIndexArray);
+        const linkCount = linkSource.length;
         
-        # Create color map for tissues
-        # Generate HSV colors then convert to RGB for better differentiation
-        color_list = [
-            "#4daf4a", "#f781bf", "#a65628", "#984ea3", "#999999", "#e41a1c", "#377eb8",
-            "#ff7f00", "#ffff33", "#a6cee3", "#1f78b4", "#b2df8a", "#33a02c", "#fb9a99",
-            "#e31a1c", "#fdbf6f", "#ff7f00", "#cab2d6", "#6a3d9a", "#ffff99", "#b15928", "#00ffff"
-        ]
+        // Partition nodes and links by type once so drawing needs no per-frame filtering
+        const geneNodes = [];
+        const tissueNodes = [];
+        const labelNodes = [];
+        let centralNode = -1;
+        for (let node = 0; node < nodeCount; node++) {
+            if (nodeType[node] === 'gene') geneNodes.push(node);
+            if (nodeType[node] === 'tissue') tissueNodes.push(node);
+            if (nodeType[node] === 'central' && centralNode < 0) centralNode = node;
+            if (nodeType[node] === 'tissue' || nodeType[node] === 'central') labelNodes.push(node);
+        }
+        // Genes ordered by palette index so Canvas2D sets fillStyle once per color run
+        const genesByColor = geneNodes.slice().sort((a, b) => nodeColorIndex[a] - nodeColorIndex[b]);
+        const coreLinks = [];
+        const geneLinks = [];
+        const isGeneLink = new Uint8Array(linkCount);
+        for (let link = 0; link < linkCount; link++) {
+            isGeneLink[link] = nodeType[linkSource[link]] === 'gene' || nodeType[linkTarget[link]] === 'gene' ? 1 : 0;
+            (isGeneLink[link] ? geneLinks : coreLinks).push(link);
+        }
         
-        tissue_colors = {}
-        for i, tissue in enumerate(tissue_types):
-            tissue_colors[tissue] = color_list[i % len(color_list)]
+        // Endpoint coordinates per link as [x0, y0, x1, y1], kept in sync with node positions
+        const linkCoords = new Float32Array(linkCount * 4);
         
-        # Set initial positions - circular distribution
-        fixed_positions = {}
+        // Links touching each node, so moving one node only refreshes its own links
+        const incidentLinks = Array.from({ length: nodeCount }, () => []);
+        for (let link = 0; link < linkCount; link++) {
+            incidentLinks[linkSource[link]].push(link);
+            incidentLinks[linkTarget[link]].push(link);
+        }
         
-        # Central node position
-        fixed_positions[central_node] = (0.0, 0.0)
+        function updateLinkCoords(link) {
+            const source = linkSource[link];
+            const target = linkTarget[link];
+            linkCoords[link * 4] = nodeX[source];
+            linkCoords[link * 4 + 1] = nodeY[source];
+            linkCoords[link * 4 + 2] = nodeX[target];
+            linkCoords[link * 4 + 3] = nodeY[target];
+        }
         
-        # Tissue nodes distributed around the circumference
-        radius = 400
-        golden_angle = math.pi * (3 - math.sqrt(5))  # Golden angle for more uniform distribution
+        function updateAllLinkCoords() {
+            for (let link = 0; link < linkCount; link++) updateLinkCoords(link);
+        }
+        updateAllLinkCoords();
+        
+        // Get elements
+        const container = document.getElementById('container');
+        const canvas = document.getElementById('network-canvas');
+        const ctx = canvas.getContext('2d');
+        const legend = document.getElementById('legend');
+        const tooltip = document.getElementById('tooltip');
+        const downloadBtn = document.getElementById('download-btn');
+        const resetZoomBtn = document.getElementById('reset-zoom');
+        const autoClusterBtn = document.getElementById('auto-cluster');
+        const glCanvas = document.getElementById('gl-canvas');
+        
+        // Set canvas dimensions
+        let width = container.clientWidth;
+        let height = container.clientHeight;
+        let scale = 1;
+        let offsetX = width / 2;
+        let offsetY = height / 2;
+        let dragNode = -1;  // Node index, -1 when nothing is dragged
+        let dragOffsetX = 0;
+        let dragOffsetY = 0;
+        let dragPixelX = 0;  // Screen pixel the dragged node was last drawn at
+        let dragPixelY = 0;
+        let isDraggingCanvas = false;
+        let startX = 0;
+        let startY = 0;
+        let panX = 0;
+        let panY = 0;
+        let panPixelX = 0;  // Whole-pixel pan currently applied as a CSS transform
+        let panPixelY = 0;
+        let drawPending = false;
+        let zoomPending = false;
+        let zoomTarget = 1;
+        let zoomX = 0;
+        let zoomY = 0;
+        let hoverPending = false;
+        let hoverX = 0;
+        let hoverY = 0;
+        let hoverClientX = 0;
+        let hoverClientY = 0;
+        let lastHoverNode = -1;
+        let currentCursor = '';
+        let tooltipVisible = false;
+        let canvasRect = canvas.getBoundingClientRect();
         
-        for i, tissue in enumerate(tissue_types):
-            angle = i * golden_angle
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            fixed_positions[tissue] = (x, y)
+        // Cached Canvas2D layer of everything except the dragged node, rebuilt when a drag starts or the view changes
+        const staticCanvas = document.createElement('canvas');
+        const staticCtx = staticCanvas.getContext('2d');
+        let staticDirty = true;
+        let dragLinks = [];
+        
+        // Min and max zoom levels
+        const MIN_SCALE = 0.1;
+        const MAX_SCALE = 5;
+        
+        // Below this zoom level gene nodes and their links are not drawn
+        const LOD_SCALE = 0.4;
+        
+        // Download high quality PNG
+        function downloadHighQualityPNG() {
+            // Create larger offscreen canvas for high-res rendering
+            const offscreenCanvas = document.createElement('canvas');
+            const dpr = window.devicePixelRatio || 2; // Use device pixel ratio or default to 2x
+            const scaleFactor = 3; // Increased resolution
             
-            # Add tissue node
-            G.add_node(tissue, node_type='tissue', gene_count=tissue_gene_counts[tissue])
-            G.add_edge(central_node, tissue, weight=5.0)
+            offscreenCanvas.width = width * dpr * scaleFactor;
+            offscreenCanvas.height = height * dpr * scaleFactor;
+            const offscreenCtx = offscreenCanvas.getContext('2d');
             
-        # Add gene nodes (limit to 150 per tissue to match original image)
-        max_genes_per_tissue = 150
-        genes_added = 0
+            // Scale to accommodate higher resolution
+            offscreenCtx.scale(dpr * scaleFactor, dpr * scaleFactor);
+            
+            // Set white background
+            offscreenCtx.fillStyle = 'white';
+            offscreenCtx.fillRect(0, 0, width, height);
+            
+            // Save current transform for global elements
+            offscreenCtx.save();
+            
+            // Add title
+            offscreenCtx.font = 'bold 20px Arial';
+            offscreenCtx.textAlign = 'center';
+            offscreenCtx.fillStyle = 'black';
+            offscreenCtx.fillText('Gene Association Network Centered on GCH1 in tumor tissue (PCC >= 0.8)', width/2, 30);
+            
+            // Draw legend to offscreen canvas
+            drawLegendToContext(offscreenCtx, width, height);
+            
+            // Restore transform state
+            offscreenCtx.restore();
+            
+            // Draw network to offscreen canvas
+            drawNetworkToContext(offscreenCtx, width, height);
+            
+            // Convert to data URL and trigger download
+            try {
+                const dataUrl = offscreenCanvas.toDataURL('image/png');
+                const downloadLink = document.createElement('a');
+                downloadLink.href = dataUrl;
+                downloadLink.download = 'gene_association_network.png';
+                document.body.appendChild(downloadLink);
+                downloadLink.click();
+                document.body.removeChild(downloadLink);
+            } catch (e) {
+                console.error('Failed to download image:', e);
+                alert('Failed to download image. Check console for more information.');
+            }
+        }
         
-        for tissue in tissue_types:
-            # Get genes for this tissue, sorted by correlation
-            tissue_genes = filtered_df[filtered_df[type_column] == tissue].sort_values('PCC', ascending=False)
+        // Draw legend to context
+        function drawLegendToContext(context, contextWidth, contextHeight) {
+            // Set legend position and style
+            const legendX = 30;
+            const legendY = 60;
+            const legendWidth = 220;
+            const lineHeight = 25;
             
-            # Limit genes per tissue
-            if len(tissue_genes) > max_genes_per_tissue:
-                print(f"Limiting {tissue} genes from {len(tissue_genes)} to {max_genes_per_tissue}")
-                tissue_genes = tissue_genes.head(max_genes_per_tissue)
+            // Draw legend background
+            context.fillStyle = 'white';
+            context.strokeStyle = '#ddd';
+            context.lineWidth = 1;
             
-            # Add selected genes to the graph
-            for idx, row in tissue_genes.iterrows():
-                gene = row['Gene Symbol']
-                pcc = row['PCC']
-                
-                if gene not in G:
-                    G.add_node(gene, node_type='gene', pcc=pcc, tissue=tissue)
-                    genes_added += 1
-                
-                G.add_edge(gene, tissue, weight=pcc * 3)
-                
-                # Set gene node position - form clusters around tissue nodes
-                # Use spiral/concentric circle layout instead of random distribution
-                # This will make genes of the same tissue form compact clusters
-                angle = (idx / len(tissue_genes)) * 2 * np.pi  # Spiral angle
-                # Higher PCC genes closer to tissue node center
-                distance = 50 + (1 - pcc) * 150  # Distance based on PCC, higher correlation = closer
+            // Calculate legend height - central node + all tissue nodes
+            const legendItems = 1 + tissueNodes.length;
+            const legendHeight = legendItems * lineHeight + 20;
+            
+            // Draw legend box
+            context.beginPath();
+            context.roundRect(
+                legendX, 
+                legendY, 
+                legendWidth, 
+                legendHeight, 
+                5
+            );
+            context.fill();
+            context.stroke();
+            
+            // Draw central node legend item
+            if (centralNode >= 0) {
+                // Draw legend dot
+                context.beginPath();
+                context.arc(legendX + 15, legendY + 20, 8, 0, Math.PI * 2);
+                context.fillStyle = 'red';
+                context.fill();
+                context.strokeStyle = 'black';
+                context.lineWidth = 1;
+                context.stroke();
                 
-                # Add cloud distribution effect - use Gaussian noise
-                # Genes closer to tissue nodes have less offset, distant ones have more, creating cloud effect
-                noise_scale = 0.3 + 0.6 * (1 - pcc)  # Higher PCC = less noise, lower PCC = more noise
-                angle_noise = (np.random.normal(0, noise_scale) * 0.5)
-                distance_noise = (np.random.normal(0, noise_scale) * 50)
+                // Draw text
+                context.font = '14px Arial';
+                context.textAlign = 'left';
+                context.fillStyle = 'black';
+                context.fillText('GCH1 (central)', legendX + 30, legendY + 24);
+            }
+            
+            // Draw tissue node legend items
+            tissueNodes.forEach((node, index) => {
+                const y = legendY + 20 + (index + 1) * lineHeight;
                 
-                # Final position calculation with cloud effect
-                cloud_angle = angle + angle_noise
-                cloud_distance = distance + distance_noise
+                // Draw legend dot
+                context.beginPath();
+                context.arc(legendX + 15, y, 8, 0, Math.PI * 2);
+                context.fillStyle = nodeColor[node];
+                context.fill();
+                context.strokeStyle = 'black';
+                context.lineWidth = 0.5;
+                context.stroke();
                 
-                x = fixed_positions[tissue][0] + cloud_distance * np.cos(cloud_angle)
-                y = fixed_positions[tissue][1] + cloud_distance * np.sin(cloud_angle)
-                fixed_positions[gene] = (x, y)
-        
-        print(f"Added {genes_added} gene nodes to graph")
+                // Draw text
+                context.font = '12px Arial';
+                context.textAlign = 'left';
+                context.fillStyle = 'black';
+                context.fillText(`${nodeId[node]} (n=${nodeGeneCount[node]})`, legendX + 30, y + 4);
+            });
+        }
         
-        # Node and connection data
-        nodes_data = []
-        links_data = []
-        
-        # Add central node
-        nodes_data.append({
-            "id": central_node,
-            "name": central_node,
-            "node_type": "central",
-            "size": 50,
-            "color": "red",
-            "x": fixed_positions[central_node][0],
-            "y": fixed_positions[central_node][1],
-            "label": f"{central_node} (central)"
-        })
-        
-        # Add tissue and gene nodes
-        for node in G.nodes():
-            if node == central_node:
-                continue
+        // Draw network to context
+        function drawNetworkToContext(context, contextWidth, contextHeight, drawGenes = true, skipNode = -1) {
+            // Save current transform state
+            context.save();
+            
+            // Set transform to match current view
+            context.translate(offsetX, offsetY);
+            context.scale(scale, scale);
+            
+            // Visible world-space rectangle, padded for outlines; anything entirely outside it is skipped
+            const margin = 2;
+            const wx0 = -offsetX / scale - margin;
+            const wy0 = -offsetY / scale - margin;
+            const wx1 = (contextWidth - offsetX) / scale + margin;
+            const wy1 = (contextHeight - offsetY) / scale + margin;
+            const isVisible = node => {
+                const x = nodeX[node];
+                const y = nodeY[node];
+                const r = nodeSize[node];
+                return x + r >= wx0 && x - r <= wx1 && y + r >= wy0 && y - r <= wy1;
+            };
+            
+            // Draw connections
+            context.lineWidth = 0.5;
+            context.strokeStyle = 'rgba(150, 150, 150, 0.2)';
+            
+            const strokeLink = link => {
+                if (linkSource[link] === skipNode || linkTarget[link] === skipNode) return;
                 
-            node_type = G.nodes[node].get('node_type')
-            
-            if node_type == 'tissue':
-                nodes_data.append({
-                    "id": node,
-                    "name": node,
-                    "node_type": "tissue",
-                    "size": 25,
-                    "color": tissue_colors.get(node, "#999999"),
-                    "gene_count": G.nodes[node].get('gene_count', 0),
-                    "x": fixed_positions[node][0],
-                    "y": fixed_positions[node][1],
-                    "label": f"{node} (n={G.nodes[node].get('gene_count', 0)})"
-                })
-            elif node_type == 'gene':
-                tissue = G.nodes[node].get('tissue')
-                nodes_data.append({
-                    "id": node,
-                    "name": node,
-                    "node_type": "gene",
-                    "size": 3,
-                    "color": tissue_colors.get(tissue, "#999999"),
-                    "pcc": float(G.nodes[node].get('pcc', 0)),
-                    "tissue": tissue,
-                    "x": fixed_positions[node][0],
-                    "y": fixed_positions[node][1]
-                })
-        
-        # Add connections
-        for source, target in G.edges():
-            links_data.append({
-                "source": source,
-                "target": target,
-                "value": float(G.edges[(source, target)].get('weight', 1))
-            })
+                // Skip links with both ends beyond the same edge of the view
+                const i = link * 4;
+                const x0 = linkCoords[i], y0 = linkCoords[i + 1], x1 = linkCoords[i + 2], y1 = linkCoords[i + 3];
+                if ((x0 < wx0 && x1 < wx0) || (x0 > wx1 && x1 > wx1) ||
+                    (y0 < wy0 && y1 < wy0) || (y0 > wy1 && y1 > wy1)) {
+                    return;
+                }
+                context.beginPath();
+                context.moveTo(x0, y0);
+                context.lineTo(x1, y1);
+                context.stroke();
+            };
+            coreLinks.forEach(strokeLink);
+            if (drawGenes) geneLinks.forEach(strokeLink);
             
-        # Create output directory if it doesn't exist
-        output_dir = os.path.dirname(output_file)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+            // Draw gene nodes as one Path2D and a single fill per color run
+            if (drawGenes) {
+                let currentColor = -1;
+                let path = null;
+                genesByColor.forEach(node => {
+                    if (node === skipNode || !isVisible(node)) return;
+                    if (nodeColorIndex[node] !== currentColor) {
+                        if (path) context.fill(path);
+                        currentColor = nodeColorIndex[node];
+                        context.fillStyle = palette[currentColor];
+                        path = new Path2D();
+                    }
+                    const x = nodeX[node];
+                    const y = nodeY[node];
+                    const r = nodeSize[node];
+                    path.moveTo(x + r, y);
+                    path.arc(x, y, r, 0, Math.PI * 2);
+                });
+                if (path) context.fill(path);
+            }
+            
+            // Draw tissue nodes (all share the same outline)
+            context.strokeStyle = 'black';
+            context.lineWidth = 1;
+            tissueNodes.forEach(node => {
+                if (node === skipNode || !isVisible(node)) return;
+                context.beginPath();
+                context.arc(nodeX[node], nodeY[node], nodeSize[node], 0, Math.PI * 2);
+                context.fillStyle = nodeColor[node];
+                context.fill();
+                context.stroke();
+            });
+            
+            // Draw central node
+            if (centralNode >= 0 && centralNode !== skipNode && isVisible(centralNode)) {
+                context.beginPath();
+                context.arc(nodeX[centralNode], nodeY[centralNode], nodeSize[centralNode], 0, Math.PI * 2);
+                context.fillStyle = nodeColor[centralNode];
+                context.fill();
+                context.strokeStyle = 'black';
+                context.lineWidth = 2;
+                context.stroke();
+            }
+            
+            // Draw labels (when a node is skipped the caller draws them above it)
+            if (skipNode < 0) drawLabelsToContext(context);
+            
+            // Restore transform state
+            context.restore();
+        }
         
-        # Generate HTML content
-        html_content = '''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Gene Association Network</title>
-            <style>
-                body {
-                    margin: 0;
-                    padding: 0;
-                    overflow: hidden;
-                    font-family: Arial, sans-serif;
-                }
-                #container {
-                    width: 100vw;
-                    height: 100vh;
-                    position: relative;
-                    background-color: white;
-                }
-                #network-canvas {
-                    position: absolute;
-                    left: 0;
-                    top: 0;
-                    width: 100%;
-                    height: 100%;
-                }
-                #title {
-                    text-align: center;
-                    font-size: 20px;
-                    margin-top: 10px;
-                    position: absolute;
-                    width: 100%;
-                    z-index: 10;
-                }
-                #legend {
-                    position: absolute;
-                    top: 10px;
-                    left: 10px;
-                    background: white;
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    padding: 10px;
-                    max-height: 80vh;
-                    overflow-y: auto;
-                    z-index: 1000;
-                }
-                .legend-item {
-                    display: flex;
-                    align-items: center;
-                    margin: 5px 0;
-                    font-size: 12px;
-                }
-                .legend-color {
-                    width: 12px;
-                    height: 12px;
-                    border-radius: 50%;
-                    display: inline-block;
-                    margin-right: 5px;
-                }
-                .label {
-                    background-color: white;
-                    border: 1px solid rgba(0,0,0,0.2);
-                    padding: 3px 6px;
-                    border-radius: 3px;
-                    font-size: 12px;
-                    pointer-events: none;
-                    white-space: nowrap;
-                }
-                .node-central {
-                    cursor: pointer;
-                    stroke: #000;
-                    stroke-width: 1.5px;
-                }
-                .node-tissue {
-                    cursor: pointer;
-                    stroke: #000;
-                    stroke-width: 1px;
-                }
-                .node-gene {
-                    cursor: pointer;
-                }
-                .link {
-                    stroke: #999;
-                    stroke-opacity: 0.2;
-                }
-                #tooltip {
-                    position: absolute;
-                    background: rgba(255, 255, 255, 0.9);
-                    border: 1px solid #ddd;
-                    border-radius: 4px;
-                    padding: 5px;
-                    pointer-events: none;
-                    font-size: 12px;
-                    display: none;
-                    z-index: 1000;
-                }
-                #instructions {
-                    position: absolute;
-                    bottom: 10px;
-                    left: 10px;
-                    background: white;
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    padding: 10px;
-                    font-size: 12px;
-                    z-index: 1000;
-                }
-                .download-btn {
-                    position: absolute;
-                    bottom: 10px;
-                    right: 10px;
-                    background: #4CAF50;
-                    color: white;
-                    border: none;
-                    border-radius: 5px;
-                    padding: 10px 15px;
-                    font-size: 14px;
-                    cursor: pointer;
-                    z-index: 1000;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.2);
-                    transition: all 0.3s;
-                }
-                .download-btn:hover {
-                    background: #45a049;
-                    box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-                }
-                .controls {
-                    position: absolute;
-                    top: 50px;
-                    right: 10px;
-                    background: white;
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    padding: 10px;
-                    z-index: 1000;
-                    display: flex;
-                    flex-direction: column;
-                    gap: 5px;
-                }
-                .controls button {
-                    background: #f0f0f0;
-                    border: 1px solid #ddd;
-                    border-radius: 3px;
-                    padding: 5px 10px;
-                    cursor: pointer;
-                    transition: all 0.2s;
-                }
-                .controls button:hover {
-                    background: #e0e0e0;
-                }
-            </style>
-        </head>
-        <body>
-            <div id="container">
-                <div id="title">Gene Association Network Centered on GCH1 in tumor tissue (PCC >= 0.8)</div>
-                <canvas id="network-canvas"></canvas>
-                <div id="legend"></div>
-                <div id="tooltip"></div>
-                <div id="instructions">
-                    <strong>Instructions:</strong><br>
-                    • Click and drag nodes to move them<br>
-                    • Use mouse wheel to zoom in/out<br>
-                    • Click and drag background to move the entire network<br>
-                    • Hover over nodes to see details
-                </div>
-                <div class="controls">
-                    <button id="reset-zoom">Reset View</button>
-                    <button id="auto-cluster">Optimize Layout</button>
-                </div>
-                <button id="download-btn" class="download-btn">Download High-Res PNG</button>
-            </div>
-            
-            <script>
-                // Network data
-                const nodesData = NODES_DATA_PLACEHOLDER;
-                const linksData = LINKS_DATA_PLACEHOLDER;
+        // Draw tissue and central node labels (context already transformed to the current view)
+        function drawLabelsToContext(context) {
+            context.font = '12px Arial';
+            context.textAlign = 'center';
+            context.textBaseline = 'middle';
+            
+            // Labels for tissue and central nodes
+            labelNodes.forEach(node => {
+                const x = nodeX[node];
+                const y = nodeY[node];
                 
-                // Create node ID to object mapping
-                const nodeMap = {};
-                nodesData.forEach(node => {
-                    nodeMap[node.id] = node;
-                });
+                // Measure text width
+                const textWidth = context.measureText(nodeLabel[node]).width;
+                const padding = 5;
+                const labelHeight = 16;
                 
-                // Get elements
-                const container = document.getElementById('container');
-                const canvas = document.getElementById('network-canvas');
-                const ctx = canvas.getContext('2d');
-                const legend = document.getElementById('legend');
-                const tooltip = document.getElementById('tooltip');
-                const downloadBtn = document.getElementById('download-btn');
-                const resetZoomBtn = document.getElementById('reset-zoom');
-                const autoClusterBtn = document.getElementById('auto-cluster');
+                // Draw background
+                context.fillStyle = 'white';
+                context.strokeStyle = '#aaa';
+                context.lineWidth = 1;
+                context.beginPath();
+                context.roundRect(
+                    x - textWidth/2 - padding,
+                    y - labelHeight/2 - padding,
+                    textWidth + padding * 2,
+                    labelHeight + padding * 2,
+                    3
+                );
+                context.fill();
+                context.stroke();
                 
-                // Set canvas dimensions
-                let width = container.clientWidth;
-                let height = container.clientHeight;
-                let scale = 1;
-                let offsetX = width / 2;
-                let offsetY = height / 2;
-                let dragNode = null;
-                let dragOffsetX = 0;
-                let dragOffsetY = 0;
-                let isDraggingCanvas = false;
-                let startX = 0;
-                let startY = 0;
+                // Draw text
+                context.fillStyle = nodeType[node] === 'central' ? 'red' : 'black';
+                context.fillText(nodeLabel[node], x, y);
+            });
+        }
+        
+        // Reset view
+        function resetView() {
+            scale = 1;
+            offsetX = width / 2;
+            offsetY = height / 2;
+            draw();
+        }
+        
+        // Optimize layout - further cluster genes by tissue
+        function optimizeLayout() {
+            // For each tissue, rearrange its genes
+            tissueNodes.forEach(tissue => {
+                const tissueGenes = geneNodes.filter(node => nodeTissue[node] === nodeId[tissue]);
                 
-                // Min and max zoom levels
-                const MIN_SCALE = 0.1;
-                const MAX_SCALE = 5;
+                // Sort genes so higher PCC values are closer to tissue center
+                tissueGenes.sort((a, b) => nodePcc[b] - nodePcc[a]);
                 
-                // Download high quality PNG
-                function downloadHighQualityPNG() {
-                    // Create larger offscreen canvas for high-res rendering
-                    const offscreenCanvas = document.createElement('canvas');
-                    const dpr = window.devicePixelRatio || 2; // Use device pixel ratio or default to 2x
-                    const scaleFactor = 3; // Increased resolution
-                    
-                    offscreenCanvas.width = width * dpr * scaleFactor;
-                    offscreenCanvas.height = height * dpr * scaleFactor;
-                    const offscreenCtx = offscreenCanvas.getContext('2d');
-                    
-                    // Scale to accommodate higher resolution
-                    offscreenCtx.scale(dpr * scaleFactor, dpr * scaleFactor);
-                    
-                    // Set white background
-                    offscreenCtx.fillStyle = 'white';
-                    offscreenCtx.fillRect(0, 0, width, height);
-                    
-                    // Save current transform for global elements
-                    offscreenCtx.save();
-                    
-                    // Add title
-                    offscreenCtx.font = 'bold 20px Arial';
-                    offscreenCtx.textAlign = 'center';
-                    offscreenCtx.fillStyle = 'black';
-                    offscreenCtx.fillText('Gene Association Network Centered on GCH1 in tumor tissue (PCC >= 0.8)', width/2, 30);
-                    
-                    // Draw legend to offscreen canvas
-                    drawLegendToContext(offscreenCtx, width, height);
+                // Use cloud layout
+                tissueGenes.forEach((gene, idx) => {
+                    // Base angle and distance
+                    const angle = (idx / tissueGenes.length) * 2 * Math.PI;
+                    const baseDistance = 40 + (1 - nodePcc[gene]) * 100;
                     
-                    // Restore transform state
-                    offscreenCtx.restore();
+                    // Add randomness for cloud distribution
+                    // Higher PCC values have less noise, creating a tighter core
+                    const noiseScale = 0.2 + 0.5 * (1 - nodePcc[gene]);
+                    const angleNoise = (Math.random() - 0.5) * noiseScale * Math.PI;
+                    const distanceNoise = (Math.random() * 2 - 1) * noiseScale * 60;
                     
-                    // Draw network to offscreen canvas
-                    drawNetworkToContext(offscreenCtx, width, height);
+                    // Apply cloud noise
+                    const cloudAngle = angle + angleNoise;
+                    const cloudDistance = Math.max(20, baseDistance + distanceNoise);
                     
-                    // Convert to data URL and trigger download
-                    try {
-                        const dataUrl = offscreenCanvas.toDataURL('image/png');
-                        const downloadLink = document.createElement('a');
-                        downloadLink.href = dataUrl;
-                        downloadLink.download = 'gene_association_network.png';
-                        document.body.appendChild(downloadLink);
-                        downloadLink.click();
-                        document.body.removeChild(downloadLink);
-                    } catch (e) {
-                        console.error('Failed to download image:', e);
-                        alert('Failed to download image. Check console for more information.');
-                    }
-                }
+                    // Update position
+                    nodeX[gene] = nodeX[tissue] + cloudDistance * Math.cos(cloudAngle);
+                    nodeY[gene] = nodeY[tissue] + cloudDistance * Math.sin(cloudAngle);
+                });
+            });
+            
+            // Redraw
+            spatialIndex.rebuild();
+            updateAllLinkCoords();
+            if (glRenderer) glRenderer.updateAll();
+            draw();
+        }
+        
+        // Resize canvas when window size changes
+        function resizeCanvas() {
+            width = container.clientWidth;
+            height = container.clientHeight;
+            canvas.width = width;
+            canvas.height = height;
+            staticCanvas.width = width;
+            staticCanvas.height = height;
+            staticDirty = true;
+            if (glRenderer) glRenderer.resize(width, height);
+            updateCanvasRect();
+            draw();
+        }
+        
+        // Cache the canvas position so mouse handlers don't force a layout per event
+        function updateCanvasRect() {
+            canvasRect = canvas.getBoundingClientRect();
+        }
+        
+        // Initialize
+        function initialize() {
+            // Create legend
+            createLegend();
+            
+            // Set event listeners
+            canvas.addEventListener('mousedown', handleMouseDown);
+            canvas.addEventListener('mousemove', handleMouseMove);
+            window.addEventListener('mouseup', handleMouseUp);
+            canvas.addEventListener('wheel', handleWheel, { passive: false });
+            window.addEventListener('resize', resizeCanvas);
+            window.addEventListener('scroll', updateCanvasRect, { passive: true });
+            if (window.ResizeObserver) new ResizeObserver(updateCanvasRect).observe(canvas);
+            downloadBtn.addEventListener('click', downloadHighQualityPNG);
+            resetZoomBtn.addEventListener('click', resetView);
+            autoClusterBtn.addEventListener('click', optimizeLayout);
+            
+            // Set initial canvas size
+            resizeCanvas();
+            
+            // Apply cluster layout on initialization
+            optimizeLayout();
+        }
+        
+        // Create legend
+        function createLegend() {
+            // Build all items off-DOM and attach them in one append
+            const fragment = document.createDocumentFragment();
+            
+            // Add GCH1 central node
+            if (centralNode >= 0) {
+                const centralItem = document.createElement('div');
+                centralItem.className = 'legend-item';
+                centralItem.innerHTML = `
+                    <span class="legend-color" style="background-color: red;"></span>
+                    <span>GCH1 (central)</span>
+                `;
+                fragment.appendChild(centralItem);
+            }
+            
+            // Add tissue nodes
+            tissueNodes.forEach(node => {
+                const item = document.createElement('div');
+                item.className = 'legend-item';
+                item.innerHTML = `
+                    <span class="legend-color" style="background-color: ${nodeColor[node]};"></span>
+                    <span>${nodeId[node]} (n=${nodeGeneCount[node]})</span>
+                `;
+                fragment.appendChild(item);
+            });
+            legend.appendChild(fragment);
+        }
+        
+        // Handle mouse down event
+        function handleMouseDown(event) {
+            const rect = canvasRect;
+            const mouseX = event.clientX - rect.left;
+            const mouseY = event.clientY - rect.top;
+            
+            // Check if clicked on a node
+            const node = getNodeAtPosition(mouseX, mouseY);
+            
+            if (node >= 0) {
+                // Drag node
+                dragNode = node;
+                dragOffsetX = (mouseX - offsetX) / scale - nodeX[node];
+                dragOffsetY = (mouseY - offsetY) / scale - nodeY[node];
+                dragPixelX = Math.round(nodeX[node] * scale);
+                dragPixelY = Math.round(nodeY[node] * scale);
+                staticDirty = true;
+                setCursor('grabbing');
+            } else {
+                // Drag canvas
+                isDraggingCanvas = true;
+                startX = mouseX;
+                startY = mouseY;
+                setCursor('grabbing');
+            }
+        }
+        
+        // Handle mouse move event
+        function handleMouseMove(event) {
+            const rect = canvasRect;
+            const mouseX = event.clientX - rect.left;
+            const mouseY = event.clientY - rect.top;
+            
+            if (dragNode >= 0) {
+                // Skip moves that wouldn't shift the node by a whole screen pixel
+                const x = (mouseX - offsetX) / scale - dragOffsetX;
+                const y = (mouseY - offsetY) / scale - dragOffsetY;
+                const pixelX = Math.round(x * scale);
+                const pixelY = Math.round(y * scale);
+                if (pixelX === dragPixelX && pixelY === dragPixelY) return;
+                dragPixelX = pixelX;
+                dragPixelY = pixelY;
                 
-                // Draw legend to context
-                function drawLegendToContext(context, contextWidth, contextHeight) {
-                    // Set legend position and style
-                    const legendX = 30;
-                    const legendY = 60;
-                    const legendWidth = 220;
-                    const lineHeight = 25;
-                    
-                    // Draw legend background
-                    context.fillStyle = 'white';
-                    context.strokeStyle = '#ddd';
-                    context.lineWidth = 1;
-                    
-                    // Calculate legend height - central node + all tissue nodes
-                    const legendItems = 1 + nodesData.filter(node => node.node_type === 'tissue').length;
-                    const legendHeight = legendItems * lineHeight + 20;
-                    
-                    // Draw legend box
-                    context.beginPath();
-                    context.roundRect(
-                        legendX, 
-                        legendY, 
-                        legendWidth, 
-                        legendHeight, 
-                        5
-                    );
-                    context.fill();
-                    context.stroke();
-                    
-                    // Draw central node legend item
-                    const centralNode = nodesData.find(node => node.node_type === 'central');
-                    if (centralNode) {
-                        // Draw legend dot
-                        context.beginPath();
-                        context.arc(legendX + 15, legendY + 20, 8, 0, Math.PI * 2);
-                        context.fillStyle = 'red';
-                        context.fill();
-                        context.strokeStyle = 'black';
-                        context.lineWidth = 1;
-                        context.stroke();
-                        
-                        // Draw text
-                        context.font = '14px Arial';
-                        context.textAlign = 'left';
-                        context.fillStyle = 'black';
-                        context.fillText('GCH1 (central)', legendX + 30, legendY + 24);
-                    }
-                    
-                    // Draw tissue node legend items
-                    const tissueNodes = nodesData.filter(node => node.node_type === 'tissue');
-                    tissueNodes.forEach((node, index) => {
-                        const y = legendY + 20 + (index + 1) * lineHeight;
-                        
-                        // Draw legend dot
-                        context.beginPath();
-                        context.arc(legendX + 15, y, 8, 0, Math.PI * 2);
-                        context.fillStyle = node.color;
-                        context.fill();
-                        context.strokeStyle = 'black';
-                        context.lineWidth = 0.5;
-                        context.stroke();
-                        
-                        // Draw text
-                        context.font = '12px Arial';
-                        context.textAlign = 'left';
-                        context.fillStyle = 'black';
-                        context.fillText(`${node.name} (n=${node.gene_count})`, legendX + 30, y + 4);
-                    });
-                }
+                // Update dragged node position
+                nodeX[dragNode] = x;
+                nodeY[dragNode] = y;
+                spatialIndex.move(dragNode);
+                incidentLinks[dragNode].forEach(updateLinkCoords);
+                if (glRenderer) glRenderer.updateNode(dragNode);
+                scheduleDraw();
+            } else if (isDraggingCanvas) {
+                // Pan canvas by moving the rendered pixels; the offset is committed on mouseup
+                panX += mouseX - startX;
+                panY += mouseY - startY;
+                startX = mouseX;
+                startY = mouseY;
                 
-                // Draw network to context
-                function drawNetworkToContext(context, contextWidth, contextHeight) {
-                    // Save current transform state
-                    context.save();
-                    
-                    // Set transform to match current view
-                    context.translate(offsetX, offsetY);
-                    context.scale(scale, scale);
-                    
-                    // Draw connections
-                    context.lineWidth = 0.5;
-                    context.strokeStyle = 'rgba(150, 150, 150, 0.2)';
-                    
-                    linksData.forEach(link => {
-                        const source = nodeMap[link.source];
-                        const target = nodeMap[link.target];
-                        
-                        if (source && target) {
-                            context.beginPath();
-                            context.moveTo(source.x, source.y);
-                            context.lineTo(target.x, target.y);
-                            context.stroke();
-                        }
-                    });
-                    
-                    // Draw gene nodes
-                    nodesData.filter(node => node.node_type === 'gene').forEach(node => {
-                        context.beginPath();
-                        context.arc(node.x, node.y, node.size, 0, Math.PI * 2);
-                        context.fillStyle = node.color;
-                        context.fill();
-                    });
-                    
-                    // Draw tissue nodes
-                    nodesData.filter(node => node.node_type === 'tissue').forEach(node => {
-                        context.beginPath();
-                        context.arc(node.x, node.y, node.size, 0, Math.PI * 2);
-                        context.fillStyle = node.color;
-                        context.fill();
-                        context.strokeStyle = 'black';
-                        context.lineWidth = 1;
-                        context.stroke();
-                    });
-                    
-                    // Draw central node
-                    const centralNode = nodesData.find(node => node.node_type === 'central');
-                    if (centralNode) {
-                        context.beginPath();
-                        context.arc(centralNode.x, centralNode.y, centralNode.size, 0, Math.PI * 2);
-                        context.fillStyle = centralNode.color;
-                        context.fill();
-                        context.strokeStyle = 'black';
-                        context.lineWidth = 2;
-                        context.stroke();
-                    }
-                    
-                    // Draw labels
-                    context.font = '12px Arial';
-                    context.textAlign = 'center';
-                    context.textBaseline = 'middle';
-                    
-                    // Labels for tissue and central nodes
-                    nodesData.filter(node => node.node_type === 'tissue' || node.node_type === 'central').forEach(node => {
-                        const x = node.x;
-                        const y = node.y;
-                        
-                        // Measure text width
-                        const textWidth = context.measureText(node.label).width;
-                        const padding = 5;
-                        const labelHeight = 16;
-                        
-                        // Draw background
-                        context.fillStyle = 'white';
-                        context.strokeStyle = '#aaa';
-                        context.lineWidth = 1;
-                        context.beginPath();
-                        context.roundRect(
-                            x - textWidth/2 - padding,
-                            y - labelHeight/2 - padding,
-                            textWidth + padding * 2,
-                            labelHeight + padding * 2,
-                            3
-                        );
-                        context.fill();
-                        context.stroke();
-                        
-                        // Draw text
-                        context.fillStyle = node.node_type === 'central' ? 'red' : 'black';
-                        context.fillText(node.label, x, y);
-                    });
-                    
-                    // Restore transform state
-                    context.restore();
-                }
+                // Only touch the transform when the pan reaches a new whole pixel
+                const pixelX = Math.round(panX);
+                const pixelY = Math.round(panY);
+                if (pixelX === panPixelX && pixelY === panPixelY) return;
+                panPixelX = pixelX;
+                panPixelY = pixelY;
+                const transform = `translate(${pixelX}px, ${pixelY}px)`;
+                canvas.style.transform = transform;
+                glCanvas.style.transform = transform;
+            } else {
+                // Check hover once per frame using the latest position
+                hoverX = mouseX;
+                hoverY = mouseY;
+                hoverClientX = event.clientX;
+                hoverClientY = event.clientY;
+                scheduleHover();
+            }
+        }
+        
+        // Schedule a hover check on the next animation frame (at most one per frame)
+        function scheduleHover() {
+            if (hoverPending) return;
+            hoverPending = true;
+            requestAnimationFrame(updateHover);
+        }
+        
+        // Update cursor and tooltip for the node under the mouse
+        function updateHover() {
+            hoverPending = false;
+            if (dragNode >= 0 || isDraggingCanvas) return;
+            
+            const node = getNodeAtPosition(hoverX, hoverY);
+            if (node >= 0) {
+                setCursor('pointer');
+                showTooltip(node, hoverClientX, hoverClientY);
+            } else {
+                setCursor('default');
+                setTooltipVisible(false);
+            }
+            lastHoverNode = node;
+        }
+        
+        // Style writes invalidate layout, so only touch the cursor and tooltip when they change
+        function setCursor(cursor) {
+            if (cursor === currentCursor) return;
+            canvas.style.cursor = cursor;
+            currentCursor = cursor;
+        }
+        
+        function setTooltipVisible(visible) {
+            if (visible === tooltipVisible) return;
+            tooltip.style.display = visible ? 'block' : 'none';
+            tooltipVisible = visible;
+        }
+        
+        // Handle mouse up event
+        function handleMouseUp() {
+            if (isDraggingCanvas) commitPan();
+            // The Canvas2D drag frame paints the dragged node on top, so restore the normal draw order
+            if (dragNode >= 0 && !glRenderer) scheduleDraw();
+            dragNode = -1;
+            isDraggingCanvas = false;
+            setCursor('default');
+        }
+        
+        // Apply the pending CSS pan to the view offset and redraw in place
+        function commitPan() {
+            if (panX === 0 && panY === 0) return;
+            offsetX += panX;
+            offsetY += panY;
+            panX = 0;
+            panY = 0;
+            panPixelX = 0;
+            panPixelY = 0;
+            canvas.style.transform = '';
+            glCanvas.style.transform = '';
+            draw();
+        }
+        
+        // Handle wheel event
+        function handleWheel(event) {
+            // Horizontal-only scrolling doesn't zoom, so leave it to the browser
+            if (event.deltaY === 0) return;
+            event.preventDefault();
+            commitPan();
+            
+            const rect = canvasRect;
+            zoomX = event.clientX - rect.left;
+            zoomY = event.clientY - rect.top;
+            
+            // Update zoom; ticks arriving within one frame accumulate into a single target scale
+            if (!zoomPending) zoomTarget = scale;
+            if (event.deltaY < 0) {
+                // Zoom in
+                zoomTarget *= 1.1;
+            } else {
+                // Zoom out
+                zoomTarget *= 0.9;
+            }
+            
+            // Constrain zoom range
+            zoomTarget = Math.max(MIN_SCALE, Math.min(MAX_SCALE, zoomTarget));
+            
+            if (zoomPending) return;
+            zoomPending = true;
+            requestAnimationFrame(applyZoom);
+        }
+        
+        // Apply the accumulated wheel zoom around the latest mouse position and redraw
+        function applyZoom() {
+            zoomPending = false;
+            
+            // Calculate mouse position relative to canvas (accounting for current offset and scale)
+            const x = (zoomX - offsetX) / scale;
+            const y = (zoomY - offsetY) / scale;
+            
+            // Adjust offset to keep mouse position at same point
+            scale = zoomTarget;
+            offsetX = zoomX - x * scale;
+            offsetY = zoomY - y * scale;
+            staticDirty = true;
+            
+            draw();
+        }
+        
+        // Get index of the node at position, or -1
+        function getNodeAtPosition(x, y) {
+            // Query the spatial index in world coordinates; smaller nodes drawn later win over larger ones behind them
+            // Genes are hidden below the LOD threshold, so only visible nodes can be hit there
+            return spatialIndex.find((x - offsetX) / scale, (y - offsetY) / scale, scale < LOD_SCALE);
+        }
+        
+        // Show tooltip
+        function showTooltip(node, clientX, clientY) {
+            // Only rebuild the content when the hovered node changes
+            if (node !== lastHoverNode) {
+                let content = '';
                 
-                // Reset view
-                function resetView() {
-                    scale = 1;
-                    offsetX = width / 2;
-                    offsetY = height / 2;
-                    draw();
+                if (nodeType[node] === 'central') {
+                    content = `<strong>${nodeId[node]}</strong><br>Central node`;
+                } else if (nodeType[node] === 'tissue') {
+                    content = `<strong>${nodeId[node]}</strong><br>Gene count: ${nodeGeneCount[node]}`;
+                } else if (nodeType[node] === 'gene') {
+                    content = `<strong>${nodeId[node]}</strong><br>PCC: ${nodePcc[node].toFixed(3)}<br>Tissue: ${nodeTissue[node]}`;
                 }
                 
-                // Optimize layout - further cluster genes by tissue
-                function optimizeLayout() {
-                    // Get all tissue nodes
-                    const tissueNodes = nodesData.filter(node => node.node_type === 'tissue');
-                    
-                    // For each tissue, rearrange its genes
-                    tissueNodes.forEach(tissue => {
-                        const tissueGenes = nodesData.filter(node => 
-                            node.node_type === 'gene' && node.tissue === tissue.name
-                        );
-                        
-                        // Sort genes so higher PCC values are closer to tissue center
-                        tissueGenes.sort((a, b) => b.pcc - a.pcc);
-                        
-                        // Use cloud layout
-                        tissueGenes.forEach((gene, idx) => {
-                            // Base angle and distance
-                            const angle = (idx / tissueGenes.length) * 2 * Math.PI;
-                            const baseDistance = 40 + (1 - gene.pcc) * 100;
-                            
-                            // Add randomness for cloud distribution
-                            // Higher PCC values have less noise, creating a tighter core
-                            const noiseScale = 0.2 + 0.5 * (1 - gene.pcc);
-                            const angleNoise = (Math.random() - 0.5) * noiseScale * Math.PI;
-                            const distanceNoise = (Math.random() * 2 - 1) * noiseScale * 60;
-                            
-                            // Apply cloud noise
-                            const cloudAngle = angle + angleNoise;
-                            const cloudDistance = Math.max(20, baseDistance + distanceNoise);
-                            
-                            // Update position
-                            gene.x = tissue.x + cloudDistance * Math.cos(cloudAngle);
-                            gene.y = tissue.y + cloudDistance * Math.sin(cloudAngle);
-                        });
-                    });
-                    
-                    // Redraw
-                    draw();
+                tooltip.innerHTML = content;
+                setTooltipVisible(true);
+            }
+            tooltip.style.left = (clientX + 10) + 'px';
+            tooltip.style.top = (clientY + 10) + 'px';
+        }
+        
+        // Draw network
+        function draw() {
+            // Clear canvas
+            ctx.clearRect(0, 0, width, height);
+            
+            if (glRenderer) {
+                // Links and nodes on the GPU, labels on the 2D canvas above
+                glRenderer.render();
+                ctx.save();
+                ctx.translate(offsetX, offsetY);
+                ctx.scale(scale, scale);
+                drawLabelsToContext(ctx);
+                ctx.restore();
+            } else if (dragNode >= 0) {
+                drawDragFrame();
+            } else {
+                // Use shared drawing function
+                drawNetworkToContext(ctx, width, height, scale >= LOD_SCALE);
+            }
+        }
+        
+        // Canvas2D drag frame: blit the cached layer, then draw the dragged node, its links and the labels on top
+        function drawDragFrame() {
+            const drawGenes = scale >= LOD_SCALE;
+            if (staticDirty) {
+                staticCtx.clearRect(0, 0, width, height);
+                drawNetworkToContext(staticCtx, width, height, drawGenes, dragNode);
+                dragLinks = incidentLinks[dragNode].filter(link => drawGenes || !isGeneLink[link]);
+                staticDirty = false;
+            }
+            ctx.drawImage(staticCanvas, 0, 0);
+            
+            ctx.save();
+            ctx.translate(offsetX, offsetY);
+            ctx.scale(scale, scale);
+            
+            ctx.lineWidth = 0.5;
+            ctx.strokeStyle = 'rgba(150, 150, 150, 0.2)';
+            dragLinks.forEach(link => {
+                const i = link * 4;
+                ctx.beginPath();
+                ctx.moveTo(linkCoords[i], linkCoords[i + 1]);
+                ctx.lineTo(linkCoords[i + 2], linkCoords[i + 3]);
+                ctx.stroke();
+            });
+            
+            const dragType = nodeType[dragNode];
+            if (drawGenes || dragType !== 'gene') {
+                ctx.beginPath();
+                ctx.arc(nodeX[dragNode], nodeY[dragNode], nodeSize[dragNode], 0, Math.PI * 2);
+                ctx.fillStyle = nodeColor[dragNode];
+                ctx.fill();
+                if (dragType !== 'gene') {
+                    ctx.strokeStyle = 'black';
+                    ctx.lineWidth = dragType === 'central' ? 2 : 1;
+                    ctx.stroke();
                 }
+            }
+            
+            drawLabelsToContext(ctx);
+            ctx.restore();
+        }
+        
+        // Schedule a redraw on the next animation frame (at most one per frame)
+        function scheduleDraw() {
+            if (drawPending) return;
+            drawPending = true;
+            requestAnimationFrame(() => {
+                drawPending = false;
+                draw();
+            });
+        }
+        
+        // WebGL renderer for links and node circles (labels stay on the 2D canvas)
+        function createGLRenderer(target) {
+            const gl = target.getContext('webgl2', { premultipliedAlpha: false });
+            if (!gl) return null;
+            
+            // Shared world -> clip space transform
+            const viewSource = `
+                uniform vec2 u_resolution;
+                uniform float u_scale;
+                uniform vec2 u_offset;
+                vec4 toClip(vec2 world) {
+                    vec2 clip = (world * u_scale + u_offset) / u_resolution * 2.0 - 1.0;
+                    return vec4(clip.x, -clip.y, 0.0, 1.0);
+                }`;
+            
+            const linkProgram = createProgram(gl, `#version 300 es
+                in vec2 a_position;
+                ${viewSource}
+                void main() {
+                    gl_Position = toClip(a_position);
+                }`, `#version 300 es
+                precision highp float;
+                uniform float u_scale;
+                out vec4 outColor;
+                void main() {
+                    // Match a 0.5 world-unit canvas stroke of rgba(150, 150, 150, 0.2)
+                    outColor = vec4(150.0 / 255.0, 150.0 / 255.0, 150.0 / 255.0, 0.2 * min(1.0, 0.5 * u_scale));
+                }`);
+            
+            const nodeProgram = createProgram(gl, `#version 300 es
+                in vec2 a_corner;
+                in vec2 a_center;
+                in float a_radius;
+                in float a_border;
+                in vec4 a_color;
+                ${viewSource}
+                out vec2 v_local;
+                out float v_radius;
+                out float v_border;
+                out vec4 v_color;
+                void main() {
+                    // Quad covers the circle, its outline and one pixel of antialiasing
+                    float extent = a_radius + a_border * 0.5 + 1.0 / u_scale;
+                    v_local = a_corner * extent;
+                    v_radius = a_radius;
+                    v_border = a_border;
+                    v_color = a_color;
+                    gl_Position = toClip(a_center + v_local);
+                }`, `#version 300 es
+                precision highp float;
+                uniform float u_scale;
+                in vec2 v_local;
+                in float v_radius;
+                in float v_border;
+                in vec4 v_color;
+                out vec4 outColor;
+                void main() {
+                    float d = length(v_local);
+                    float aa = 1.0 / u_scale;
+                    float outer = v_radius + v_border * 0.5;
+                    float alpha = 1.0 - smoothstep(outer - aa, outer, d);
+                    if (alpha <= 0.0) discard;
+                    vec3 rgb = v_color.rgb;
+                    if (v_border > 0.0) {
+                        float inner = v_radius - v_border * 0.5;
+                        rgb = mix(rgb, vec3(0.0), smoothstep(inner - aa, inner, d));
+                    }
+                    outColor = vec4(rgb, v_color.a * alpha);
+                }`);
+            
+            if (!linkProgram || !nodeProgram) return null;
+            
+            // Draw order matches the 2D renderer: genes, then tissues, then the central node
+            const typeRank = { gene: 0, tissue: 1, central: 2 };
+            const order = Array.from({ length: nodeCount }, (_, node) => node).sort((a, b) => typeRank[nodeType[a]] - typeRank[nodeType[b]]);
+            const geneCount = geneNodes.length;
+            const nodeSlot = new Uint32Array(nodeCount);
+            
+            const positions = new Float32Array(nodeCount * 2);
+            const radii = new Float32Array(nodeCount);
+            const borders = new Float32Array(nodeCount);
+            const colors = new Uint8Array(nodeCount * 4);
+            
+            // Normalize each palette color (any CSS color) to #rrggbb bytes once
+            const colorProbe = document.createElement('canvas').getContext('2d');
+            const paletteBytes = palette.map(color => {
+                colorProbe.fillStyle = color;
+                const hex = colorProbe.fillStyle;
+                return [parseInt(hex.slice(1, 3), 16), parseInt(hex.slice(3, 5), 16), parseInt(hex.slice(5, 7), 16), 255];
+            });
+            
+            order.forEach((node, slot) => {
+                nodeSlot[node] = slot;
+                positions[slot * 2] = nodeX[node];
+                positions[slot * 2 + 1] = nodeY[node];
+                radii[slot] = nodeSize[node];
+                borders[slot] = nodeType[node] === 'central' ? 2 : nodeType[node] === 'tissue' ? 1 : 0;
+                colors.set(paletteBytes[nodeColorIndex[node]], slot * 4);
+            });
+            
+            // Link endpoints as node slots, uploaded once; links without genes come first so they can be drawn alone
+            const linkIndices = [];
+            coreLinks.concat(geneLinks).forEach(link => {
+                linkIndices.push(nodeSlot[linkSource[link]], nodeSlot[linkTarget[link]]);
+            });
+            const coreLinkIndexCount = coreLinks.length * 2;
+            
+            const positionBuffer = createBuffer(gl, gl.ARRAY_BUFFER, positions, gl.DYNAMIC_DRAW);
+            
+            // Links: one LINES draw over the shared position buffer
+            const linkVao = gl.createVertexArray();
+            gl.bindVertexArray(linkVao);
+            bindAttribute(gl, linkProgram, 'a_position', positionBuffer, 2, gl.FLOAT, false, 0);
+            createBuffer(gl, gl.ELEMENT_ARRAY_BUFFER, new Uint32Array(linkIndices), gl.STATIC_DRAW);
+            
+            // Nodes: one instanced quad per node
+            const cornerBuffer = createBuffer(gl, gl.ARRAY_BUFFER, new Float32Array([-1, -1, 1, -1, -1, 1, 1, 1]), gl.STATIC_DRAW);
+            const radiusBuffer = createBuffer(gl, gl.ARRAY_BUFFER, radii, gl.STATIC_DRAW);
+            const borderBuffer = createBuffer(gl, gl.ARRAY_BUFFER, borders, gl.STATIC_DRAW);
+            const colorBuffer = createBuffer(gl, gl.ARRAY_BUFFER, colors, gl.STATIC_DRAW);
+            function createNodeVao(firstSlot) {
+                const vao = gl.createVertexArray();
+                gl.bindVertexArray(vao);
+                bindAttribute(gl, nodeProgram, 'a_corner', cornerBuffer, 2, gl.FLOAT, false, 0);
+                bindAttribute(gl, nodeProgram, 'a_center', positionBuffer, 2, gl.FLOAT, false, 1, firstSlot * 8);
+                bindAttribute(gl, nodeProgram, 'a_radius', radiusBuffer, 1, gl.FLOAT, false, 1, firstSlot * 4);
+                bindAttribute(gl, nodeProgram, 'a_border', borderBuffer, 1, gl.FLOAT, false, 1, firstSlot * 4);
+                bindAttribute(gl, nodeProgram, 'a_color', colorBuffer, 4, gl.UNSIGNED_BYTE, true, 1, firstSlot * 4);
+                gl.bindVertexArray(null);
+                return vao;
+            }
+            const nodeVao = createNodeVao(0);
+            // Same attributes starting after the genes, for zoomed-out views
+            const coreNodeVao = createNodeVao(geneCount);
+            
+            function setView(program) {
+                gl.useProgram(program);
+                gl.uniform2f(gl.getUniformLocation(program, 'u_resolution'), width, height);
+                gl.uniform1f(gl.getUniformLocation(program, 'u_scale'), scale);
+                gl.uniform2f(gl.getUniformLocation(program, 'u_offset'), offsetX, offsetY);
+            }
+            
+            return {
+                resize(newWidth, newHeight) {
+                    target.width = newWidth;
+                    target.height = newHeight;
+                    gl.viewport(0, 0, newWidth, newHeight);
+                },
                 
-                // Resize canvas when window size changes
-                function resizeCanvas() {
-                    width = container.clientWidth;
-                    height = container.clientHeight;
-                    canvas.width = width;
-                    canvas.height = height;
-                    draw();
-                }
+                // Re-upload only the moved node's position
+                updateNode(node) {
+                    const slot = nodeSlot[node];
+                    positions[slot * 2] = nodeX[node];
+                    positions[slot * 2 + 1] = nodeY[node];
+                    gl.bindBuffer(gl.ARRAY_BUFFER, positionBuffer);
+                    gl.bufferSubData(gl.ARRAY_BUFFER, slot * 8, positions, slot * 2, 2);
+                },
                 
-                // Initialize
-                function initialize() {
-                    // Create legend
-                    createLegend();
+                // Re-upload every position (after a layout change)
+                updateAll() {
+                    order.forEach((node, slot) => {
+                        positions[slot * 2] = nodeX[node];
+                        positions[slot * 2 + 1] = nodeY[node];
+                    });
+                    gl.bindBuffer(gl.ARRAY_BUFFER, positionBuffer);
+                    gl.bufferSubData(gl.ARRAY_BUFFER, 0, positions);
+                },
+                
+                render() {
+                    gl.clearColor(0, 0, 0, 0);
+                    gl.clear(gl.COLOR_BUFFER_BIT);
+                    gl.enable(gl.BLEND);
+                    gl.blendFuncSeparate(gl.SRC_ALPHA, gl.ONE_MINUS_SRC_ALPHA, gl.ONE, gl.ONE_MINUS_SRC_ALPHA);
                     
-                    // Set event listeners
-                    canvas.addEventListener('mousedown', handleMouseDown);
-                    canvas.addEventListener('mousemove', handleMouseMove);
-                    window.addEventListener('mouseup', handleMouseUp);
-                    canvas.addEventListener('wheel', handleWheel);
-                    window.addEventListener('resize', resizeCanvas);
-                    downloadBtn.addEventListener('click', downloadHighQualityPNG);
-                    resetZoomBtn.addEventListener('click', resetView);
-                    autoClusterBtn.addEventListener('click', optimizeLayout);
+                    const drawGenes = scale >= LOD_SCALE;
                     
-                    // Set initial canvas size
-                    resizeCanvas();
+                    setView(linkProgram);
+                    gl.bindVertexArray(linkVao);
+                    gl.drawElements(gl.LINES, drawGenes ? linkIndices.length : coreLinkIndexCount, gl.UNSIGNED_INT, 0);
                     
-                    // Apply cluster layout on initialization
-                    optimizeLayout();
+                    setView(nodeProgram);
+                    gl.bindVertexArray(drawGenes ? nodeVao : coreNodeVao);
+                    gl.drawArraysInstanced(gl.TRIANGLE_STRIP, 0, 4, drawGenes ? nodeCount : nodeCount - geneCount);
+                    gl.bindVertexArray(null);
                 }
-                
-                // Create legend
-                function createLegend() {
-                    // Add GCH1 central node
-                    const centralNode = nodeMap['GCH1'];
-                    if (centralNode) {
-                        const centralItem = document.createElement('div');
-                        centralItem.className = 'legend-item';
-                        centralItem.innerHTML = `
-                            <span class="legend-color" style="background-color: red;"></span>
-                            <span>GCH1 (central)</span>
-                        `;
-                        legend.appendChild(centralItem);
-                    }
-                    
-                    // Add tissue nodes
-                    const tissueNodes = nodesData.filter(node => node.node_type === 'tissue');
-                    tissueNodes.forEach(node => {
-                        const item = document.createElement('div');
-                        item.className = 'legend-item';
-                        item.innerHTML = `
-                            <span class="legend-color" style="background-color: ${node.color};"></span>
-                            <span>${node.name} (n=${node.gene_count})</span>
-                        `;
-                        legend.appendChild(item);
-                    });
+            };
+        }
+        
+        // Compile and link a shader program
+        function createProgram(gl, vertexSource, fragmentSource) {
+            const program = gl.createProgram();
+            [[gl.VERTEX_SHADER, vertexSource], [gl.FRAGMENT_SHADER, fragmentSource]].forEach(([type, source]) => {
+                const shader = gl.createShader(type);
+                gl.shaderSource(shader, source);
+                gl.compileShader(shader);
+                gl.attachShader(program, shader);
+            });
+            gl.linkProgram(program);
+            if (!gl.getProgramParameter(program, gl.LINK_STATUS)) {
+                console.error('Failed to link WebGL program:', gl.getProgramInfoLog(program));
+                return null;
+            }
+            return program;
+        }
+        
+        // Create a buffer and upload data to it
+        function createBuffer(gl, bufferType, data, usage) {
+            const buffer = gl.createBuffer();
+            gl.bindBuffer(bufferType, buffer);
+            gl.bufferData(bufferType, data, usage);
+            return buffer;
+        }
+        
+        // Point a vertex attribute at a buffer (divisor 1 = per instance)
+        function bindAttribute(gl, program, name, buffer, size, type, normalized, divisor, byteOffset = 0) {
+            const location = gl.getAttribLocation(program, name);
+            gl.bindBuffer(gl.ARRAY_BUFFER, buffer);
+            gl.enableVertexAttribArray(location);
+            gl.vertexAttribPointer(location, size, type, normalized, 0, byteOffset);
+            gl.vertexAttribDivisor(location, divisor);
+        }
+        
+        // Quadtree over node centers so hit-testing only visits nearby nodes
+        function createSpatialIndex() {
+            const LEAF_CAPACITY = 8;
+            const MAX_DEPTH = 16;
+            const maxRadius = nodeSize.reduce((max, size) => Math.max(max, size), 0);
+            
+            let root = null;
+            let outside = [];  // Nodes dragged beyond the indexed bounds
+            const leafOf = new Array(nodeCount).fill(null);
+            
+            function makeCell(x0, y0, x1, y1, depth) {
+                return { x0, y0, x1, y1, depth, items: [], children: null };
+            }
+            
+            function insert(cell, node) {
+                while (cell.children) {
+                    const midX = (cell.x0 + cell.x1) / 2;
+                    const midY = (cell.y0 + cell.y1) / 2;
+                    cell = cell.children[(nodeX[node] >= midX ? 1 : 0) + (nodeY[node] >= midY ? 2 : 0)];
                 }
-                
-                // Handle mouse down event
-                function handleMouseDown(event) {
-                    const rect = canvas.getBoundingClientRect();
-                    const mouseX = event.clientX - rect.left;
-                    const mouseY = event.clientY - rect.top;
-                    
-                    // Check if clicked on a node
-                    const node = getNodeAtPosition(mouseX, mouseY);
-                    
-                    if (node) {
-                        // Drag node
-                        dragNode = node;
-                        dragOffsetX = (mouseX - offsetX) / scale - node.x;
-                        dragOffsetY = (mouseY - offsetY) / scale - node.y;
-                        canvas.style.cursor = 'grabbing';
-                    } else {
-                        // Drag canvas
-                        isDraggingCanvas = true;
-                        startX = mouseX;
-                        startY = mouseY;
-                        canvas.style.cursor = 'grabbing';
-                    }
+                cell.items.push(node);
+                leafOf[node] = cell;
+                if (cell.items.length > LEAF_CAPACITY && cell.depth < MAX_DEPTH) {
+                    split(cell);
                 }
-                
-                // Handle mouse move event
-                function handleMouseMove(event) {
-                    const rect = canvas.getBoundingClientRect();
-                    const mouseX = event.clientX - rect.left;
-                    const mouseY = event.clientY - rect.top;
-                    
-                    if (dragNode) {
-                        // Update dragged node position
-                        dragNode.x = (mouseX - offsetX) / scale - dragOffsetX;
-                        dragNode.y = (mouseY - offsetY) / scale - dragOffsetY;
-                        draw();
-                    } else if (isDraggingCanvas) {
-                        // Pan canvas
-                        offsetX += mouseX - startX;
-                        offsetY += mouseY - startY;
-                        startX = mouseX;
-                        startY = mouseY;
-                        draw();
-                    } else {
-                        // Check hover
-                        const node = getNodeAtPosition(mouseX, mouseY);
-                        if (node) {
-                            canvas.style.cursor = 'pointer';
-                            showTooltip(node, event.clientX, event.clientY);
-                        } else {
-                            canvas.style.cursor = 'default';
-                            tooltip.style.display = 'none';
-                        }
-                    }
+            }
+            
+            function split(cell) {
+                const midX = (cell.x0 + cell.x1) / 2;
+                const midY = (cell.y0 + cell.y1) / 2;
+                const depth = cell.depth + 1;
+                cell.children = [
+                    makeCell(cell.x0, cell.y0, midX, midY, depth),
+                    makeCell(midX, cell.y0, cell.x1, midY, depth),
+                    makeCell(cell.x0, midY, midX, cell.y1, depth),
+                    makeCell(midX, midY, cell.x1, cell.y1, depth)
+                ];
+                const items = cell.items;
+                cell.items = [];
+                items.forEach(node => insert(cell, node));
+            }
+            
+            function add(node) {
+                const x = nodeX[node];
+                const y = nodeY[node];
+                if (x < root.x0 || x > root.x1 || y < root.y0 || y > root.y1) {
+                    outside.push(node);
+                    leafOf[node] = null;
+                } else {
+                    insert(root, node);
                 }
-                
-                // Handle mouse up event
-                function handleMouseUp() {
-                    dragNode = null;
-                    isDraggingCanvas = false;
-                    canvas.style.cursor = 'default';
+            }
+            
+            function remove(node) {
+                const leaf = leafOf[node];
+                const items = leaf ? leaf.items : outside;
+                const i = items.indexOf(node);
+                if (i >= 0) {
+                    items[i] = items[items.length - 1];
+                    items.pop();
                 }
-                
-                // Handle wheel event
-                function handleWheel(event) {
-                    event.preventDefault();
-                    
-                    const rect = canvas.getBoundingClientRect();
-                    const mouseX = event.clientX - rect.left;
-                    const mouseY = event.clientY - rect.top;
-                    
-                    // Calculate mouse position relative to canvas (accounting for current offset and scale)
-                    const x = (mouseX - offsetX) / scale;
-                    const y = (mouseY - offsetY) / scale;
-                    
-                    // Update zoom
-                    if (event.deltaY < 0) {
-                        // Zoom in
-                        scale *= 1.1;
-                    } else {
-                        // Zoom out
-                        scale *= 0.9;
+            }
+            
+            return {
+                // Index all nodes at their current positions
+                rebuild() {
+                    let x0 = Infinity, y0 = Infinity, x1 = -Infinity, y1 = -Infinity;
+                    for (let node = 0; node < nodeCount; node++) {
+                        x0 = Math.min(x0, nodeX[node]);
+                        y0 = Math.min(y0, nodeY[node]);
+                        x1 = Math.max(x1, nodeX[node]);
+                        y1 = Math.max(y1, nodeY[node]);
                     }
-                    
-                    // Constrain zoom range
-                    scale = Math.max(MIN_SCALE, Math.min(MAX_SCALE, scale));
-                    
-                    // Adjust offset to keep mouse position at same point
-                    offsetX = mouseX - x * scale;
-                    offsetY = mouseY - y * scale;
-                    
-                    draw();
-                }
+                    const pad = maxRadius + 1;
+                    root = makeCell(x0 - pad, y0 - pad, x1 + pad, y1 + pad, 0);
+                    outside = [];
+                    leafOf.fill(null);
+                    for (let node = 0; node < nodeCount; node++) add(node);
+                },
                 
-                // Get node at position
-                function getNodeAtPosition(x, y) {
-                    // Check from smallest to largest nodes (by size) so smaller nodes can be selected even if behind larger ones
-                    for (let i = nodesData.length - 1; i >= 0; i--) {
-                        const node = nodesData[i];
-                        const nodeScreenX = node.x * scale + offsetX;
-                        const nodeScreenY = node.y * scale + offsetY;
-                        const size = node.size * scale;
-                        
-                        // Check if click position is within node
-                        const distance = Math.sqrt(Math.pow(x - nodeScreenX, 2) + Math.pow(y - nodeScreenY, 2));
-                        if (distance <= size) {
-                            return node;
-                        }
-                    }
-                    return null;
-                }
+                // Re-file a node after its position changed
+                move(node) {
+                    remove(node);
+                    add(node);
+                },
                 
-                // Show tooltip
-                function showTooltip(node, clientX, clientY) {
-                    let content = '';
+                // Topmost node containing the world-space point, or -1 (later nodes win, as in draw order)
+                // Gene nodes are ignored when skipGenes is set, so hidden genes don't shadow the tissues beneath them
+                find(x, y, skipGenes = false) {
+                    let best = -1;
+                    const test = items => {
+                        for (let i = 0, n = items.length; i < n; i++) {
+                            const node = items[i];
+                            if (skipGenes && nodeType[node] === 'gene') continue;
+                            const dx = x - nodeX[node];
+                            const dy = y - nodeY[node];
+                            const r = nodeSize[node];
+                            if (dx * dx + dy * dy <= r * r && node > best) {
+                                best = node;
+                            }
+                        }
+                    };
                     
-                    if (node.node_type === 'central') {
-                        content = `<strong>${node.name}</strong><br>Central node`;
-                    } else if (node.node_type === 'tissue') {
-                        content = `<strong>${node.name}</strong><br>Gene count: ${node.gene_count}`;
-                    } else if (node.node_type === 'gene') {
-                        content = `<strong>${node.name}</strong><br>PCC: ${node.pcc.toFixed(3)}<br>Tissue: ${node.tissue}`;
+                    test(outside);
+                    const stack = [root];
+                    while (stack.length) {
+                        const cell = stack.pop();
+                        // Skip cells farther than the largest node radius from the point
+                        if (x + maxRadius < cell.x0 || x - maxRadius > cell.x1 || y + maxRadius < cell.y0 || y - maxRadius > cell.y1) {
+                            continue;
+                        }
+                        if (cell.children) {
+                            stack.push(...cell.children);
+                        } else {
+                            test(cell.items);
+                        }
                     }
-                    
-                    tooltip.innerHTML = content;
-                    tooltip.style.left = (clientX + 10) + 'px';
-                    tooltip.style.top = (clientY + 10) + 'px';
-                    tooltip.style.display = 'block';
+                    return best;
                 }
-                
-                // Draw network
-                function draw() {
-                    // Clear canvas
-                    ctx.clearRect(0, 0, width, height);
-                    
-                    // Use shared drawing function
-                    drawNetworkToContext(ctx, width, height);
-                }
-                
-                // Initialize app
-                initialize();
-            </script>
-        </body>
-        </html>
-        '''
+            };
+        }
+        
+        // Spatial index for hit-testing, rebuilt whenever the layout changes
+        const spatialIndex = createSpatialIndex();
+        
+        // Use WebGL when available, otherwise fall back to Canvas2D
+        const glRenderer = createGLRenderer(glCanvas);
+        
+        // Initialize app
+        initialize();
+    </script>
+</body>
+</html>
+'''
+
+# Template split around the data placeholders and encoded once at import
+HTML_HEAD, HTML_REST = HTML_TEMPLATE.encode('utf-8').split(b'NODES_DATA_PLACEHOLDER')
+HTML_MIDDLE, HTML_TAIL = HTML_REST.split(b'LINKS_DATA_PLACEHOLDER')
+
+def cloud_layout(pcc, tx, ty, rng):
+    """Compute cloud-distributed gene positions around a tissue node at (tx, ty)"""
+    # Set gene node positions - form clusters around tissue nodes
+    # Use spiral/concentric circle layout instead of random distribution
+    # This will make genes of the same tissue form compact clusters
+    n = len(pcc)
+    if n == 0:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+    angle = np.arange(n, dtype=np.float32) * np.float32(2 * np.pi / n)  # Spiral angle
+    # Higher PCC genes closer to tissue node center
+    distance = np.float32(50) + (np.float32(1) - pcc) * np.float32(150)  # Distance based on PCC, higher correlation = closer
+    
+    # Add cloud distribution effect - use Gaussian noise
+    # Genes closer to tissue nodes have less offset, distant ones have more, creating cloud effect
+    noise_scale = np.float32(0.3) + np.float32(0.6) * (np.float32(1) - pcc)  # Higher PCC = less noise, lower PCC = more noise
+    angle += rng.standard_normal(n, dtype=np.float32) * noise_scale * np.float32(0.5)
+    distance += rng.standard_normal(n, dtype=np.float32) * noise_scale * np.float32(50)
+    
+    # Final position calculation with cloud effect (float32 is plenty for pixel positions)
+    xs = np.float32(tx) + distance * np.cos(angle)
+    ys = np.float32(ty) + distance * np.sin(angle)
+    return xs, ys
+
+def pack_column(values, dtype):
+    """Encode a numeric column as base64 of its little-endian bytes"""
+    return base64.b64encode(np.asarray(values, dtype=dtype).tobytes()).decode('ascii')
+
+def create_web_network(input_file='data/tumor.csv', central_node='GCH1', output_file='Network Tumor/index.html'):
+    """Create web-based interactive network visualization and save as HTML file"""
+    print(f"Loading data from {input_file}...")
+    
+    try:
+        # Read and filter data (only the columns used below; PCC stays float64 so tooltips round the values as written)
+        type_column = 'Tumor'
+        df = pd.read_csv(input_file, usecols=['Gene Symbol', 'PCC', type_column],
+                         dtype={'Gene Symbol': 'string', 'PCC': 'float64', type_column: 'category'})
+        # Rows without a gene symbol or tissue can't be placed, so drop them along with the PCC filter
+        keep_rows = ((df['PCC'].to_numpy() >= 0.8) & df['Gene Symbol'].notna().to_numpy()
+                     & df[type_column].notna().to_numpy())
+        filtered_df = df.loc[keep_rows]  # read-only below, so no copy
+        
+        # Count genes for each tissue type
+        tissue_types = filtered_df[type_column].unique()
+        tissue_gene_counts = filtered_df[type_column].value_counts(sort=False, dropna=False).to_dict()  # Same keys as unique()
+        print(f"Found {len(tissue_types)} tissue types with {len(filtered_df)} genes")
+        
+        # Create color map for tissues
+        # Generate HSV colors then convert to RGB for better differentiation
+        color_list = [
+            "#4daf4a", "#f781bf", "#a65628", "#984ea3", "#999999", "#e41a1c", "#377eb8",
+            "#ff7f00", "#ffff33", "#a6cee3", "#1f78b4", "#b2df8a", "#33a02c", "#fb9a99",
+            "#e31a1c", "#fdbf6f", "#ff7f00", "#cab2d6", "#6a3d9a", "#ffff99", "#b15928", "#00ffff"
+        ]
+        
+        # Palette indexed by tissue code (tissues keep their order of first appearance)
+        tissue_codes = np.arange(len(tissue_types))
+        tissue_palette = np.array(color_list)[tissue_codes % len(color_list)].tolist()
+        
+        # Set initial positions - circular distribution
+        fixed_positions = {}
+        
+        # Node and connection data as columns (one list per field, indexed by node / link)
+        # Fields that don't apply to a node type are null
+        node_fields = ['id', 'node_type', 'size', 'color', 'x', 'y', 'label', 'gene_count', 'pcc', 'tissue']
+        nodes_data = {field: [] for field in node_fields}
+        links_data = {'source': [], 'target': [], 'value': []}
+        
+        # Add central node
+        fixed_positions[central_node] = (0.0, 0.0)
+        
+        for field, value in zip(node_fields, [central_node, 'central', 50, 'red', 0.0, 0.0,
+                                              f"{central_node} (central)", None, None, None]):
+            nodes_data[field].append(value)
+        
+        # Tissue nodes distributed around the circumference
+        radius = 400
+        golden_angle = math.pi * (3 - math.sqrt(5))  # Golden angle for more uniform distribution
+        
+        angles = np.arange(len(tissue_types)) * golden_angle
+        tissue_xs = (radius * np.cos(angles)).tolist()
+        tissue_ys = (radius * np.sin(angles)).tolist()
+        tissue_names = list(tissue_types)
+        tissue_counts = [tissue_gene_counts[tissue] for tissue in tissue_names]
+        n_tissues = len(tissue_names)
+        
+        fixed_positions.update(zip(tissue_names, zip(tissue_xs, tissue_ys)))
+        nodes_data['id'].extend(tissue_names)
+        nodes_data['node_type'].extend(['tissue'] * n_tissues)
+        nodes_data['size'].extend([25] * n_tissues)
+        nodes_data['color'].extend(tissue_palette)
+        nodes_data['x'].extend(tissue_xs)
+        nodes_data['y'].extend(tissue_ys)
+        nodes_data['label'].extend(f"{tissue} (n={count})" for tissue, count in zip(tissue_names, tissue_counts))
+        nodes_data['gene_count'].extend(tissue_counts)
+        nodes_data['pcc'].extend([None] * n_tissues)
+        nodes_data['tissue'].extend([None] * n_tissues)
+        
+        # Links reference nodes by their index in the columns
+        links_data['source'].extend([0] * n_tissues)
+        links_data['target'].extend(range(1, n_tissues + 1))
+        links_data['value'].extend([5.0] * n_tissues)
+        core_pairs = {frozenset((0, tissue_index)) for tissue_index in range(1, n_tissues + 1)}
+        
+        # Add gene nodes (limit to 150 per tissue to match original image)
+        max_genes_per_tissue = 150
+        gene_arrays = {'id': [], 'pcc': [], 'tissue': [], 'x': [], 'y': [], 'color': []}  # One column per field
+        gene_pcc_exact = []  # PCC per gene as read, for the page's 3-decimal display
+        # Node index by id, seeded with central and tissue names so genes never shadow them
+        node_index = {node_id: i for i, node_id in enumerate(nodes_data['id'])}
+        rng = np.random.default_rng()  # One generator for all cloud noise
+        
+        # Sort once by correlation and partition by tissue in a single pass
+        tissue_groups = filtered_df.sort_values('PCC', ascending=False).groupby(type_column, sort=False, observed=True)
+        
+        for tissue_index, (tissue, color) in enumerate(zip(tissue_names, tissue_palette), start=1):
+            # Get genes for this tissue, sorted by correlation
+            tissue_genes = tissue_groups.get_group(tissue)
+            
+            # Limit genes per tissue
+            if len(tissue_genes) > max_genes_per_tissue:
+                print(f"Limiting {tissue} genes from {len(tissue_genes)} to {max_genes_per_tissue}")
+                tissue_genes = tissue_genes.head(max_genes_per_tissue)
+            
+            pcc = tissue_genes['PCC'].to_numpy()
+            pcc_out = pcc.round(6)
+            genes = tissue_genes['Gene Symbol'].to_numpy()
+            
+            # Place genes in a cloud around their tissue node
+            xs, ys = cloud_layout(pcc.astype(np.float32), *fixed_positions[tissue], rng)
+            
+            # Keep the first occurrence of each gene (tolist() yields plain Python scalars)
+            # A gene shared by several tissues keeps the attributes and position of the first one
+            gene_list = genes.tolist()
+            keep = []
+            for i, gene in enumerate(gene_list):
+                if gene not in node_index:
+                    node_index[gene] = len(node_index)
+                    keep.append(i)
+            
+            new_ids = genes[keep].tolist()
+            new_pcc = pcc_out[keep].tolist()
+            new_xs = xs[keep].tolist()
+            new_ys = ys[keep].tolist()
+            
+            # Append to the gene columns
+            gene_arrays['id'].extend(new_ids)
+            gene_arrays['pcc'].extend(new_pcc)
+            gene_pcc_exact.extend(pcc[keep].tolist())
+            gene_arrays['tissue'].extend([tissue] * len(keep))
+            gene_arrays['x'].extend(new_xs)
+            gene_arrays['y'].extend(new_ys)
+            gene_arrays['color'].extend([color] * len(keep))
+            fixed_positions.update(zip(new_ids, zip(new_xs, new_ys)))
+            
+            # Link every selected gene to the tissue (a repeated gene keeps its last weight)
+            gene_weights = dict(zip(gene_list, (pcc_out * 3).tolist()))
+            # A gene named after the central node or a tissue reuses that node, so link each such pair only once
+            for gene in [gene for gene in gene_weights if node_index[gene] <= n_tissues]:
+                pair = frozenset((tissue_index, node_index[gene]))
+                if pair in core_pairs:
+                    del gene_weights[gene]
+                else:
+                    core_pairs.add(pair)
+            links_data['source'].extend([tissue_index] * len(gene_weights))
+            links_data['target'].extend(node_index[gene] for gene in gene_weights)
+            links_data['value'].extend(gene_weights.values())
+        
+        # Append the gene columns after the central and tissue nodes
+        n_genes = len(gene_arrays['id'])
+        for field, values in gene_arrays.items():
+            nodes_data[field].extend(values)
+        nodes_data['node_type'].extend(['gene'] * n_genes)
+        nodes_data['size'].extend([3] * n_genes)
+        nodes_data['label'].extend([None] * n_genes)
+        nodes_data['gene_count'].extend([None] * n_genes)
+        
+        print(f"Added {n_genes} gene nodes to network")
+        
+        # Create output directory if it doesn't exist
+        output_dir = os.path.dirname(output_file)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        
+        # Pack numeric node columns for the page as base64 typed arrays and colors as palette indices
+        # Positions match the page's Float32Array; PCC is only shown to 3 decimals, so it ships as int16
+        # thousandths rounded once from the value as read, the way the tooltip's toFixed(3) rounds
+        palette = list(dict.fromkeys(nodes_data['color']))
+        palette_index = {color: i for i, color in enumerate(palette)}
+        pcc_step = Decimal('0.001')
+        pcc_column = [0] * (1 + n_tissues) + [int(Decimal(pcc).quantize(pcc_step, rounding=ROUND_HALF_UP) / pcc_step)
+                                              for pcc in gene_pcc_exact]
+        nodes_payload = {
+            **nodes_data,
+            'x': pack_column(nodes_data['x'], '<f4'),
+            'y': pack_column(nodes_data['y'], '<f4'),
+            'size': pack_column(nodes_data['size'], 'u1'),
+            'pcc': pack_column(pcc_column, '<i2'),
+            'color': pack_column([palette_index[color] for color in nodes_data['color']], 'u1'),
+            'palette': palette
+        }
+        
+        # Link endpoints are node indices: uint16 while they fit, otherwise uint32
+        # Weights aren't used by the page, so only create_web_network's return value carries them
+        index_bytes = 2 if len(nodes_data['id']) <= 0xFFFF else 4
+        index_dtype = f'<u{index_bytes}'
+        links_payload = {
+            'source': pack_column(links_data['source'], index_dtype),
+            'target': pack_column(links_data['target'], index_dtype),
+            'index_bytes': index_bytes
+        }
         
-        # Replace data placeholders
-        html_content = html_content.replace('NODES_DATA_PLACEHOLDER', json.dumps(nodes_data))
-        html_content = html_content.replace('LINKS_DATA_PLACEHOLDER', json.dumps(links_data))
+        # Compact JSON: no whitespace after separators and no \u escaping
+        json_options = {'separators': (',', ':'), 'ensure_ascii': False}
         
-        # Write HTML file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Write HTML file as pre-encoded template bytes around the JSON payloads
+        with open(output_file, 'wb', buffering=1 << 20) as f:
+            f.write(HTML_HEAD)
+            f.write(json.dumps(nodes_payload, **json_options).encode('utf-8'))
+            f.write(HTML_MIDDLE)
+            f.write(json.dumps(links_payload, **json_options).encode('utf-8'))
+            f.write(HTML_TAIL)
         
         print(f"Network visualization saved to {output_file} and opened in browser")
         
         # Open in browser
         webbrowser.open('file://' + os.path.abspath(output_file))
         
-        return G, fixed_positions
+        return nodes_data, links_data, fixed_positions
         
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
-        return None, None
+        return None, None, None
 
 if __name__ == "__main__":
     print("Creating web-based interactive network visualization...")